@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Dict, Generic, Iterator, List
 
+import torch
 from torch import nn
 from torch.nn import Parameter
 from torchtyping import TensorType
@@ -19,11 +20,24 @@ class ObjectiveOutput:
 
     Attributes:
         loss: The loss value.
-        metrics: A dictionary of metrics.
+        metrics: A dictionary of metrics. The values are either floats or scalar tensors.
     """
 
     loss: TensorType[float]
-    metrics: Dict[str, float] = field(default_factory=dict)
+    metrics: Dict[str, float | TensorType[float]] = field(default_factory=dict)
+
+    def get_float_metrics(self) -> Dict[str, float]:
+        """
+        Return the metrics converted to python floats. Objectives may store scalar tensors in `metrics` so that the
+        device synchronization is deferred until the metrics are actually logged.
+
+        Returns:
+            A dictionary of metrics with float values.
+        """
+        return {
+            key: value.item() if isinstance(value, torch.Tensor) else value
+            for key, value in self.metrics.items()
+        }
 
 
 class ObjectiveBase(nn.Module, ABC, Generic[TState, TActionSpace, TAction], TrainingHooksMixin):
@@ -85,18 +99,22 @@ class ObjectiveBase(nn.Module, ABC, Generic[TState, TActionSpace, TAction], Trai
             None
         """
         actions = trajectories.get_actions_flat()  # [n_actions]
-
         forward_states = trajectories.get_non_last_states_flat()  # [n_actions]
         forward_action_spaces = trajectories.get_forward_action_spaces_flat()  # [n_actions]
-        forward_log_prob = self.forward_policy.compute_action_log_probs(
-            states=forward_states, action_spaces=forward_action_spaces, actions=actions
-        )  # [n_actions]
-
         backward_states = trajectories.get_non_source_states_flat()  # [n_actions]
         backward_action_spaces = trajectories.get_backward_action_spaces_flat()  # [n_actions]
-        backward_log_prob = self.backward_policy.compute_action_log_probs(
-            states=backward_states, action_spaces=backward_action_spaces, actions=actions
-        )  # [n_actions]
+
+        (
+            forward_log_prob,
+            backward_log_prob,
+        ) = self.backward_policy.compute_action_log_probs_with_backbone(
+            backbone_policy=self.forward_policy,
+            forward_states=forward_states,
+            forward_action_spaces=forward_action_spaces,
+            backward_states=backward_states,
+            backward_action_spaces=backward_action_spaces,
+            actions=actions,
+        )  # [n_actions], [n_actions]
 
         trajectories.set_forward_log_probs_flat(forward_log_prob)
         trajectories.set_backward_log_probs_flat(backward_log_prob)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Generic, List
+from typing import Dict, Generic, List, Tuple
 
 from torchtyping import TensorType
 
@@ -69,3 +69,49 @@ class PolicyBase(Generic[TState, TActionSpace, TAction], ABC, TrainingHooksMixin
             a tensor of log flows of shape `(n_states,)`.
         """
         ...
+
+    def shares_backbone_with(self, policy: "PolicyBase[TState, TActionSpace, TAction]") -> bool:
+        """
+        Whether this (backward) policy uses the given (forward) policy as its backbone. If so, the policy can share
+        the computations of the backbone in `compute_action_log_probs_with_backbone`.
+
+        Args:
+            policy: a forward policy.
+
+        Returns:
+            True if the policy is the backbone of this policy, False otherwise.
+        """
+        return False
+
+    def compute_action_log_probs_with_backbone(
+        self,
+        backbone_policy: "PolicyBase[TState, TActionSpace, TAction]",
+        forward_states: List[TState],
+        forward_action_spaces: List[TActionSpace],
+        backward_states: List[TState],
+        backward_action_spaces: List[TActionSpace],
+        actions: List[TAction],
+    ) -> Tuple[TensorType[float], TensorType[float]]:
+        """
+        Compute the log probabilities of the given actions under the backbone (forward) policy and under this
+        (backward) policy. By default, both policies compute their log probabilities separately. The policies for
+        which `shares_backbone_with` can return True may override it to share the computations of the backbone.
+
+        Args:
+            backbone_policy: a forward policy.
+            forward_states: a list of states in which the actions were taken in the forward direction.
+            forward_action_spaces: a list of forward action spaces of length `n_states`.
+            backward_states: a list of states in which the actions were taken in the backward direction.
+            backward_action_spaces: a list of backward action spaces of length `n_states`.
+            actions: a list of actions of length `n_states`.
+
+        Returns:
+            a tuple of the forward and backward log probabilities, each of shape `(n_states,)`.
+        """
+        forward_log_probs = backbone_policy.compute_action_log_probs(
+            states=forward_states, action_spaces=forward_action_spaces, actions=actions
+        )
+        backward_log_probs = self.compute_action_log_probs(
+            states=backward_states, action_spaces=backward_action_spaces, actions=actions
+        )
+        return forward_log_probs, backward_log_probs
@@ -1,8 +1,9 @@
 import math
-from typing import Dict, Generic, List, Literal
+from typing import Dict, Generic, List, Literal, Tuple
 
 import gin
 import torch
+from torch import Tensor
 
 from rgfn.api.proxy_base import ProxyBase
 from rgfn.api.reward_output import RewardOutput
@@ -11,6 +12,20 @@ from rgfn.api.trajectories import Trajectories
 from rgfn.api.type_variables import TState
 
 
+@torch.jit.script
+def _linear_reward(value: Tensor, beta: float, min_reward: float) -> Tuple[Tensor, Tensor]:
+    reward = (value * beta).clamp_min(min_reward)
+    return reward, reward.log()
+
+
+@torch.jit.script
+def _exponential_reward(value: Tensor, beta: float, min_log_reward: float) -> Tuple[Tensor, Tensor]:
+    log_reward = value * beta
+    if min_log_reward != -float("inf"):
+        log_reward = log_reward.clamp_min(min_log_reward)
+    return log_reward.exp(), log_reward
+
+
 @gin.configurable()
 class Reward(Generic[TState], TrainingHooksMixin):
     """
@@ -50,7 +65,7 @@ class Reward(Generic[TState], TrainingHooksMixin):
     def hook_objects(self) -> List["TrainingHooksMixin"]:
         return [self.proxy]
 
-    @torch.no_grad()
+    @torch.inference_mode()
     def compute_reward_output(self, states: List[TState]) -> RewardOutput:
         """
         Compute the reward output on a batch of states.
@@ -66,13 +81,9 @@ class Reward(Generic[TState], TrainingHooksMixin):
         value = proxy_output.value
         signed_value = value if self.proxy.higher_is_better else -value
         if self.reward_boosting == "linear":
-            reward = signed_value * self.beta
-            reward = torch.clamp(reward, min=self.min_reward)
-            log_reward = reward.log()
+            reward, log_reward = _linear_reward(signed_value, self.beta, self.min_reward)
         else:
-            log_reward = signed_value * self.beta
-            log_reward = torch.clamp(log_reward, min=self.min_log_reward)
-            reward = log_reward.exp()
+            reward, log_reward = _exponential_reward(signed_value, self.beta, self.min_log_reward)
         return RewardOutput(
             log_reward=log_reward,
             reward=reward,
@@ -1,6 +1,5 @@
 import abc
 from abc import ABC
-from itertools import compress
 from typing import Dict, Generic, Iterator, List
 
 import torch
@@ -64,7 +63,7 @@ class SamplerBase(ABC, Generic[TState, TActionSpace, TAction], TrainingHooksMixi
         """
         ...
 
-    @torch.no_grad()
+    @torch.inference_mode()
     def sample_trajectories_from_sources(
         self, source_states: List[TState]
     ) -> Trajectories[TState, TActionSpace, TAction]:
@@ -82,11 +81,14 @@ class SamplerBase(ABC, Generic[TState, TActionSpace, TAction], TrainingHooksMixi
         trajectories.add_source_states(source_states)
         while True:
             current_states = trajectories.get_last_states_flat()
-            terminal_mask = self.env.get_terminal_mask(current_states)
-            if all(terminal_mask):
+            terminal_mask = torch.as_tensor(
+                self.env.get_terminal_mask(current_states), dtype=torch.bool
+            )
+            if terminal_mask.all():
                 break
-            non_terminal_mask = [not t for t in terminal_mask]
-            non_terminal_states = list(compress(current_states, non_terminal_mask))
+            non_terminal_mask = ~terminal_mask
+            non_terminal_indices = non_terminal_mask.nonzero(as_tuple=True)[0].tolist()
+            non_terminal_states = [current_states[idx] for idx in non_terminal_indices]
 
             forward_action_spaces = self.env.get_forward_action_spaces(non_terminal_states)
             new_actions = self.policy.sample_actions(non_terminal_states, forward_action_spaces)
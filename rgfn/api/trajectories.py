@@ -1,11 +1,12 @@
 import itertools
-from typing import Any, Generic, List
+from typing import Any, Generic, Iterable, List
 
 import torch
 from torchtyping import TensorType
 
 from rgfn.api.reward_output import RewardOutput
 from rgfn.api.type_variables import TAction, TActionSpace, TState
+from rgfn.utils.helpers import to_device_tensor
 
 
 class Trajectories(Generic[TState, TActionSpace, TAction]):
@@ -65,7 +66,7 @@ class Trajectories(Generic[TState, TActionSpace, TAction]):
         states: List[TState],
         forward_action_spaces: List[TActionSpace],
         backward_action_spaces: List[TActionSpace],
-        not_terminated_mask: List[bool] | None = None,
+        not_terminated_mask: TensorType[bool] | List[bool] | None = None,
     ) -> None:
         """
         It extends the not-terminated trajectories with the new actions leading to the new states.
@@ -77,14 +78,16 @@ class Trajectories(Generic[TState, TActionSpace, TAction]):
                 chosen.
             backward_action_spaces: a list of backward action spaces of length `n_new_states` from which the actions
                 may be chosen in the backward direction.
-            not_terminated_mask: a list of booleans of length `n_trajectories` indicating which trajectories we want to
-                extend. If None, all trajectories are extended. It sums to `n_new_states`.
+            not_terminated_mask: a boolean tensor or list of length `n_trajectories` indicating which trajectories we
+                want to extend. If None, all trajectories are extended. It sums to `n_new_states`.
 
         Returns:
             None
         """
         if not_terminated_mask is None:
             indices = list(range(len(states)))
+        elif isinstance(not_terminated_mask, torch.Tensor):
+            indices = not_terminated_mask.nonzero(as_tuple=True)[0].tolist()
         else:
             indices = [i for i, mask in enumerate(not_terminated_mask) if mask]
         for out_idx, in_idx in enumerate(indices):
@@ -165,18 +168,21 @@ class Trajectories(Generic[TState, TActionSpace, TAction]):
             for action_space in action_spaces
         ]
 
-    def get_index_flat(self) -> TensorType[int]:
+    def get_index_flat(self, device: str | torch.device = "cpu") -> TensorType[int]:
         """
         Return a tensor of indices. i-th element of the tensor is the index of the trajectory to which the i-th action
             belongs.
 
+        Args:
+            device: the device on which the tensor is created.
+
         Returns:
             a tensor of indices. The length of the tensor is equal to `n_total_actions`.
         """
         actions_count = [len(actions) for actions in self._actions_list]
-        sizes = torch.tensor(actions_count)
-        indices = torch.arange(len(self._actions_list))
-        return torch.repeat_interleave(indices, sizes).long()
+        sizes = to_device_tensor(actions_count, dtype=torch.long, device=device)
+        indices = torch.arange(len(self._actions_list), device=device)
+        return torch.repeat_interleave(indices, sizes, output_size=sum(actions_count))
 
     def set_reward_outputs(self, reward_outputs: RewardOutput) -> None:
         """
@@ -350,34 +356,34 @@ class Trajectories(Generic[TState, TActionSpace, TAction]):
 
     @classmethod
     def from_trajectories(
-        cls, trajectories_list: List["Trajectories[TState, TActionSpace, TAction]"]
+        cls, trajectories_list: Iterable["Trajectories[TState, TActionSpace, TAction]"]
     ) -> "Trajectories[TState, TActionSpace, TAction]":
         """
-        Concatenate a list of Trajectories objects into a single Trajectories object.
+        Concatenate Trajectories objects into a single Trajectories object. The input is consumed in a single pass,
+        so it can be a generator that yields the batches lazily.
 
         Args:
-            trajectories_list: a list of Trajectories objects.
+            trajectories_list: an iterable of Trajectories objects.
 
         Returns:
             a new Trajectories object that is the concatenation of the input trajectories.
         """
-        if len(trajectories_list) == 1:
-            return trajectories_list[0]
-
         trajectories: Trajectories[TState, TActionSpace, TAction] = Trajectories()
-
+        rewards_list = []
+        forward_log_probs_list = []
+        backward_log_probs_list = []
+        first_trajectory = None
+        n_merged = 0
         for trajectory in trajectories_list:
+            if n_merged == 0:
+                first_trajectory = trajectory
+            n_merged += 1
             trajectories._states_list.extend(trajectory._states_list)
             trajectories._forward_action_spaces_list.extend(trajectory._forward_action_spaces_list)
             trajectories._backward_action_spaces_list.extend(
                 trajectory._backward_action_spaces_list
             )
             trajectories._actions_list.extend(trajectory._actions_list)
-
-        rewards_list = []
-        forward_log_probs_list = []
-        backward_log_probs_list = []
-        for trajectory in trajectories_list:
             if trajectory._reward_outputs is not None:
                 rewards_list.append(trajectory._reward_outputs)
             if trajectory._forward_log_probs_flat is not None:
@@ -385,6 +391,9 @@ class Trajectories(Generic[TState, TActionSpace, TAction]):
             if trajectory._backward_log_probs_flat is not None:
                 backward_log_probs_list.append(trajectory._backward_log_probs_flat)
 
+        if n_merged == 1:
+            return first_trajectory  # type: ignore
+
         if rewards_list:
             trajectories._reward_outputs = RewardOutput.from_list(rewards_list)
         if forward_log_probs_list:
@@ -1,10 +1,34 @@
 import abc
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import InitVar, dataclass, field
 from typing import Any, FrozenSet, Generic, List, NamedTuple, Tuple, TypeVar
 
 from rdkit import Chem
 from rdkit.Chem import AllChem, MolFromSmarts
 
+from rgfn.utils.helpers import Cache
+
+# Only the molecules constructed from SMILES strings (e.g. the loaded fragments) are cached. The molecules produced
+# by the environment are constructed from `Chem.Mol` objects and are not cached.
+_MOL_CACHE: Cache[str, Tuple[Chem.Mol, str, bool]] = Cache(max_size=10_000)
+_PATTERN_CACHE: Cache[str, Chem.Mol] = Cache()
+_REACTION_PARSE_CACHE: Cache[str, Tuple[AllChem.ChemicalReaction, Tuple["Pattern", ...]]] = Cache()
+
+
+def _parse_molecule(mol_or_smiles: str | Chem.Mol) -> Tuple[Chem.Mol | None, str, bool]:
+    rdkit_mol = (
+        Chem.MolFromSmiles(mol_or_smiles) if isinstance(mol_or_smiles, str) else mol_or_smiles
+    )
+    if rdkit_mol is None:
+        return None, mol_or_smiles, False
+    if Chem.SanitizeMol(rdkit_mol, catchErrors=True) == 0:
+        rdkit_mol = Chem.RemoveHs(rdkit_mol)
+        valid = True
+    else:
+        valid = False
+    return rdkit_mol, Chem.MolToSmiles(rdkit_mol), valid
+
 
 @dataclass(frozen=True)
 class Molecule:
@@ -13,26 +37,51 @@ class Molecule:
     rdkit_mol: Chem.Mol = field(init=False, repr=False, compare=False, hash=False)
     idx: int | None = field(repr=False, compare=False, default=None, hash=False)
     valid: bool = field(init=False, repr=False, compare=False, hash=False)
-
-    def __post_init__(self, mol_or_smiles: str | Chem.Mol):
-        rdkit_mol = (
-            Chem.MolFromSmiles(mol_or_smiles) if isinstance(mol_or_smiles, str) else mol_or_smiles
-        )
-        if rdkit_mol is None:
-            canonical_smiles = mol_or_smiles
-            valid = False
+    _preparsed: InitVar[Tuple[Chem.Mol | None, str, bool] | None] = None
+
+    def __post_init__(
+        self,
+        mol_or_smiles: str | Chem.Mol,
+        _preparsed: Tuple[Chem.Mol | None, str, bool] | None = None,
+    ):
+        if _preparsed is not None:
+            parsed = _preparsed
+        elif isinstance(mol_or_smiles, str) and mol_or_smiles in _MOL_CACHE:
+            parsed = _MOL_CACHE[mol_or_smiles]
         else:
-            if Chem.SanitizeMol(rdkit_mol, catchErrors=True) == 0:
-                rdkit_mol = Chem.RemoveHs(rdkit_mol)
-                valid = True
-            else:
-                valid = False
-            canonical_smiles = Chem.MolToSmiles(rdkit_mol)
+            parsed = _parse_molecule(mol_or_smiles)
 
+        if isinstance(mol_or_smiles, str) and mol_or_smiles not in _MOL_CACHE:
+            _MOL_CACHE[mol_or_smiles] = parsed
+        rdkit_mol, canonical_smiles, valid = parsed
         object.__setattr__(self, "rdkit_mol", rdkit_mol)
         object.__setattr__(self, "smiles", canonical_smiles)
         object.__setattr__(self, "valid", valid)
 
+    @classmethod
+    def from_smiles_batch(
+        cls, smiles: List[str], indices: List[int] | None = None
+    ) -> List["Molecule"]:
+        """
+        Creates molecules from a list of SMILES. The uncached SMILES are parsed and sanitized in a thread pool, as
+        RDKit releases the GIL in its C++ code.
+
+        Args:
+            smiles: a list of SMILES.
+            indices: an optional list of molecule indices (`idx` attribute) of the same length as `smiles`.
+
+        Returns:
+            a list of molecules of the same length as `smiles`.
+        """
+        indices = indices if indices is not None else [None] * len(smiles)
+        uncached_smiles = list({s for s in smiles if s not in _MOL_CACHE})
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            parsed_list = list(executor.map(_parse_molecule, uncached_smiles))
+        smiles_to_parsed = dict(zip(uncached_smiles, parsed_list))
+        return [
+            cls(s, idx=idx, _preparsed=smiles_to_parsed.get(s)) for s, idx in zip(smiles, indices)
+        ]
+
     def __repr__(self):
         return str(self)
 
@@ -49,9 +98,12 @@ class Pattern:
     rdkit_pattern: Chem.Mol = field(init=False, hash=False, compare=False)
 
     def __post_init__(self):
-        rdkit_pattern = MolFromSmarts(self.pattern)
+        rdkit_pattern = _PATTERN_CACHE.get(self.pattern)
         if rdkit_pattern is None:
-            raise ValueError(f"Invalid pattern SMILES: {self.pattern}")
+            rdkit_pattern = MolFromSmarts(self.pattern)
+            if rdkit_pattern is None:
+                raise ValueError(f"Invalid pattern SMILES: {self.pattern}")
+            _PATTERN_CACHE[self.pattern] = rdkit_pattern
         object.__setattr__(self, "rdkit_pattern", rdkit_pattern)
 
     def __repr__(self):
@@ -72,10 +124,15 @@ class Reaction:
         left, right = self.reaction.split(">>")
         left, right = left.strip(), right.strip()
         reaction = f"{left} >> {right}"
-        rxn = AllChem.ReactionFromSmarts(reaction)
-        if rxn is None:
-            raise ValueError(f"Invalid reaction SMILES: {self.reaction}")
-        left_side_rdkit_patterns = tuple(Pattern(p) for p in left.split("."))
+        parsed = _REACTION_PARSE_CACHE.get(reaction)
+        if parsed is None:
+            rxn = AllChem.ReactionFromSmarts(reaction)
+            if rxn is None:
+                raise ValueError(f"Invalid reaction SMILES: {self.reaction}")
+            left_side_rdkit_patterns = tuple(Pattern(p) for p in left.split("."))
+            _REACTION_PARSE_CACHE[reaction] = (rxn, left_side_rdkit_patterns)
+        else:
+            rxn, left_side_rdkit_patterns = parsed
         object.__setattr__(self, "reaction", reaction)
         object.__setattr__(self, "rdkit_rxn", rxn)
         object.__setattr__(self, "left_side_patterns", left_side_rdkit_patterns)
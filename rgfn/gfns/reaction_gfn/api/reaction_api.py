@@ -1,7 +1,8 @@
 import abc
 from dataclasses import dataclass, field
-from typing import Any, FrozenSet, Generic, List, NamedTuple, Tuple, TypeVar
+from typing import Any, FrozenSet, Generic, List, NamedTuple, Sequence, Tuple, TypeVar
 
+import numpy as np
 from rdkit import Chem
 
 from rgfn.shared.policies.uniform_policy import IndexedActionSpaceBase
@@ -41,6 +42,12 @@ class ReactionActionSpace0(IndexedActionSpaceBase[ReactionAction0]):
     def get_idx_of_action(self, action: ReactionAction0) -> int:
         return action.idx
 
+    @classmethod
+    def batch_get_idx_of_actions(
+        cls, action_spaces: Sequence["ReactionActionSpace0"], actions: Sequence[ReactionAction0]
+    ) -> np.ndarray:
+        return np.fromiter((action.idx for action in actions), dtype=np.int64, count=len(actions))
+
     def get_possible_actions_indices(self) -> List[int]:
         return [idx for idx, mask in enumerate(self.possible_actions_mask) if mask]
 
@@ -95,6 +102,14 @@ class ReactionActionSpace0Invalid(IndexedActionSpaceBase[ReactionAction0Invalid]
     def get_idx_of_action(self, action: ReactionAction0Invalid) -> int:
         return 0
 
+    @classmethod
+    def batch_get_idx_of_actions(
+        cls,
+        action_spaces: Sequence["ReactionActionSpace0Invalid"],
+        actions: Sequence[ReactionAction0Invalid],
+    ) -> np.ndarray:
+        return np.zeros(len(actions), dtype=np.int64)
+
     def get_possible_actions_indices(self) -> List[int]:
         return [0]
 
@@ -140,6 +155,12 @@ class ReactionActionSpaceA(IndexedActionSpaceBase[ReactionActionA]):
     def get_idx_of_action(self, action: ReactionActionA) -> int:
         return action.idx
 
+    @classmethod
+    def batch_get_idx_of_actions(
+        cls, action_spaces: Sequence["ReactionActionSpaceA"], actions: Sequence[ReactionActionA]
+    ) -> np.ndarray:
+        return np.fromiter((action.idx for action in actions), dtype=np.int64, count=len(actions))
+
     def get_possible_actions_indices(self) -> List[int]:
         return [idx for idx, mask in enumerate(self.possible_actions_mask) if mask]
 
@@ -186,7 +207,7 @@ class ReactionActionSpaceB(IndexedActionSpaceBase[ReactionActionB]):
         return self.possible_actions[idx]
 
     def get_idx_of_action(self, action: ReactionActionB) -> int:
-        return list(self.possible_actions).index(action)
+        return self.possible_actions.index(action)
 
     def get_possible_actions_indices(self) -> List[int]:
         return list(range(len(self.possible_actions)))
@@ -236,7 +257,7 @@ class ReactionActionSpaceC(IndexedActionSpaceBase[ReactionActionC]):
         return self.possible_actions[idx]
 
     def get_idx_of_action(self, action: ReactionActionC) -> int:
-        return list(self.possible_actions).index(action)
+        return self.possible_actions.index(action)
 
     def get_possible_actions_indices(self) -> List[int]:
         return list(range(len(self.possible_actions)))
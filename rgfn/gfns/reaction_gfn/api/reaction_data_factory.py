@@ -54,7 +54,9 @@ class ReactionDataFactory:
         else:
             fragments_list = pd.read_csv(fragment_path)["SMILES"].tolist()
         fragments_list = list(set(MolToSmiles(MolFromSmiles(x)) for x in fragments_list))
-        self.fragments = [Molecule(f, idx=idx) for idx, f in enumerate(fragments_list)]
+        self.fragments = Molecule.from_smiles_batch(
+            fragments_list, indices=list(range(len(fragments_list)))
+        )
 
         print(
             f"Using {len(self.fragments)} fragments, {len(self.reactions)} reactions, and {len(self.anchored_reactions)} anchored reactions"
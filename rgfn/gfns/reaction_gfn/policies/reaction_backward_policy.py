@@ -1,13 +1,15 @@
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Type
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Set, Tuple, Type
 
 import gin
 import torch
 from torch import nn
-from torch.distributions import Categorical
 from torch.nn import Parameter
+from torch.nn.utils.rnn import pad_sequence
+from torch_geometric.data import Data
 from torchtyping import TensorType
 
+from rgfn.api.policy_base import PolicyBase
 from rgfn.api.trajectories import Trajectories
 from rgfn.api.type_variables import TAction, TActionSpace, TState
 from rgfn.gfns.reaction_gfn.api.reaction_api import (
@@ -34,9 +36,12 @@ from rgfn.gfns.reaction_gfn.policies.graph_transformer import (
 from rgfn.gfns.reaction_gfn.policies.reaction_forward_policy import (
     ReactionForwardPolicy,
 )
-from rgfn.gfns.reaction_gfn.policies.utils import one_hot, to_dense_embeddings
+from rgfn.gfns.reaction_gfn.policies.reaction_forward_policy import (
+    SharedEmbeddings as ForwardSharedEmbeddings,
+)
 from rgfn.shared.policies.few_phase_policy import FewPhasePolicyBase, TSharedEmbeddings
 from rgfn.shared.policies.uniform_policy import TIndexedActionSpace
+from rgfn.utils.helpers import Cache, to_device_tensor
 
 
 @dataclass(frozen=True)
@@ -57,14 +62,26 @@ class ReactionBackwardPolicy(
         num_layers: int = 5,
         linear_output: bool = False,
         backbone_policy: ReactionForwardPolicy | None = None,
+        compile_model: bool = False,
+        compile_mode: str = "reduce-overhead",
+        use_bf16: bool = False,
+        allow_tf32: bool = False,
     ):
         super().__init__()
+        if backbone_policy is not None and (use_bf16 or compile_model):
+            # with a backbone, the embeddings are computed by the backbone policy
+            raise ValueError("use_bf16 and compile_model are not supported with a backbone_policy.")
+        self.use_bf16 = use_bf16 and torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+        if allow_tf32:
+            torch.backends.cuda.matmul.allow_tf32 = True
         self.anchored_reactions = data_factory.get_anchored_reactions()
         self.reaction_to_idx = {
             reaction: idx for idx, reaction in enumerate(self.anchored_reactions)
         }
         self.fragments = data_factory.get_fragments()
         self.use_backbone = backbone_policy is not None
+        # stored in a tuple so that nn.Module does not register the backbone as a submodule
+        self._backbone_policy = (backbone_policy,)
         self.gnn = (
             GraphTransformer(
                 x_dim=71,
@@ -87,6 +104,13 @@ class ReactionBackwardPolicy(
             if not linear_output
             else nn.Linear(hidden_dim, 1)
         )
+        if compile_model:
+            self.mlp_c = torch.compile(self.mlp_c, mode=compile_mode)
+            self.gnn = torch.compile(self.gnn, mode=compile_mode)
+        self._graph_cache: Cache[str, Data] = Cache()
+        self.register_buffer(
+            "_reaction_eye", torch.eye(len(self.anchored_reactions)), persistent=False
+        )
         self._action_space_type_to_forward_fn = {
             ReactionActionSpace0: self._forward_deterministic,
             ReactionActionSpace0Invalid: self._forward_deterministic,
@@ -111,25 +135,24 @@ class ReactionBackwardPolicy(
         action_spaces: List[ReactionActionSpaceC],
         shared_embeddings: SharedEmbeddings,
     ) -> TensorType[float]:
-        embedding_indices_list = []
-        for action_space in action_spaces:
-            embedding_indices = [
-                shared_embeddings.molecule_and_reaction_to_idx[
-                    (action.input_molecule, action.input_reaction)
-                ]
+        molecule_and_reaction_to_idx = shared_embeddings.molecule_and_reaction_to_idx
+        lengths = [len(action_space.possible_actions) for action_space in action_spaces]
+        embedding_indices = to_device_tensor(
+            [
+                molecule_and_reaction_to_idx[(action.input_molecule, action.input_reaction)]
+                for action_space in action_spaces
                 for action in action_space.possible_actions
-            ]
-            embedding_indices_list.append(embedding_indices)
-        embedding_indices_flat = [idx for indices in embedding_indices_list for idx in indices]
-        embedding_indices = torch.tensor(embedding_indices_flat).long().to(self.device)
+            ],
+            dtype=torch.long,
+            device=self.device,
+        )
         embeddings = torch.index_select(
             shared_embeddings.all_embeddings, index=embedding_indices, dim=0
         )
         logits = self.mlp_c(embeddings).squeeze(-1)
-        logits, _ = to_dense_embeddings(
-            logits, [len(indices) for indices in embedding_indices_list], fill_value=float("-inf")
+        return pad_sequence(
+            torch.split(logits, lengths), batch_first=True, padding_value=float("-inf")
         )
-        return logits
 
     def _forward_deterministic(
         self,
@@ -138,53 +161,158 @@ class ReactionBackwardPolicy(
         shared_embeddings: SharedEmbeddings,
     ) -> TensorType[float]:
         assert len(states) == len(action_spaces)
-        max_action_idx = max(
+        action_indices = [
             action_space.get_possible_actions_indices()[0] for action_space in action_spaces
+        ]
+        max_action_idx = max(action_indices)
+        logits = torch.full(
+            (len(action_spaces), max_action_idx + 1), float("-inf"), device=self.device
         )
-        logits_list = []
-        for action_space in action_spaces:
-            logits = [-float("inf")] * (max_action_idx + 1)
-            logits[action_space.get_possible_actions_indices()[0]] = 0
-            logits_list.append(logits)
-        return torch.tensor(logits_list).float().to(self.device)
+        index = to_device_tensor(action_indices, dtype=torch.long, device=self.device)
+        return logits.scatter_(1, index.unsqueeze(1), 0.0)
 
-    def get_shared_embeddings(
-        self, states: List[ReactionState], action_spaces: List[ReactionActionSpace]
-    ) -> SharedEmbeddings:
+    @property
+    def backbone_policy(self) -> ReactionForwardPolicy | None:
+        return self._backbone_policy[0]
+
+    @staticmethod
+    def _get_molecules_reactions(
+        action_spaces: List[ReactionActionSpace],
+    ) -> Set[Tuple[Molecule, Reaction]]:
         all_molecules_reactions = set()
-        for state, action_space in zip(states, action_spaces):
+        for action_space in action_spaces:
             if isinstance(action_space, ReactionActionSpaceC):
                 for action in action_space.possible_actions:
                     all_molecules_reactions.add((action.input_molecule, action.input_reaction))
+        return all_molecules_reactions
+
+    def get_shared_embeddings_with_backbone(
+        self,
+        forward_states: List[ReactionState],
+        forward_action_spaces: List[ReactionActionSpace],
+        backward_states: List[ReactionState],
+        backward_action_spaces: List[ReactionActionSpace],
+    ) -> Tuple[ForwardSharedEmbeddings, SharedEmbeddings]:
+        """
+        Computes the shared embeddings of the backbone (forward) policy and of this policy in a single backbone pass.
+        The (molecule, reaction) pairs needed by this policy are added to the pairs embedded by the backbone policy,
+        so the overlapping pairs are embedded only once.
+
+        Args:
+            forward_states: the states passed to the backbone policy.
+            forward_action_spaces: the action spaces passed to the backbone policy.
+            backward_states: the states passed to this policy.
+            backward_action_spaces: the action spaces passed to this policy.
+
+        Returns:
+            a tuple of the backbone policy shared embeddings and this policy shared embeddings.
+        """
+        molecules_reactions = self._get_molecules_reactions(backward_action_spaces)
+        forward_shared_embeddings = self.backbone_policy.get_shared_embeddings(
+            forward_states, forward_action_spaces, extra_molecules_reactions=molecules_reactions
+        )
+        molecule_reaction_to_idx = forward_shared_embeddings.molecule_reaction_to_idx
+        backward_shared_embeddings = SharedEmbeddings(
+            molecule_and_reaction_to_idx={
+                molecule_reaction: molecule_reaction_to_idx[molecule_reaction]
+                for molecule_reaction in molecules_reactions
+            },
+            all_embeddings=forward_shared_embeddings.all_embeddings,
+        )
+        return forward_shared_embeddings, backward_shared_embeddings
+
+    def shares_backbone_with(self, policy: PolicyBase) -> bool:
+        return self.use_backbone and policy is self.backbone_policy
+
+    def compute_action_log_probs_with_backbone(
+        self,
+        backbone_policy: PolicyBase,
+        forward_states: List[ReactionState],
+        forward_action_spaces: List[ReactionActionSpace],
+        backward_states: List[ReactionState],
+        backward_action_spaces: List[ReactionActionSpace],
+        actions: List[ReactionAction],
+    ) -> Tuple[TensorType[float], TensorType[float]]:
+        if not self.shares_backbone_with(backbone_policy):
+            return super().compute_action_log_probs_with_backbone(
+                backbone_policy,
+                forward_states,
+                forward_action_spaces,
+                backward_states,
+                backward_action_spaces,
+                actions,
+            )
+        (
+            forward_shared_embeddings,
+            backward_shared_embeddings,
+        ) = self.get_shared_embeddings_with_backbone(
+            forward_states, forward_action_spaces, backward_states, backward_action_spaces
+        )
+        forward_log_probs = self.backbone_policy.compute_action_log_probs(
+            states=forward_states,
+            action_spaces=forward_action_spaces,
+            actions=actions,
+            shared_embeddings=forward_shared_embeddings,
+        )
+        backward_log_probs = self.compute_action_log_probs(
+            states=backward_states,
+            action_spaces=backward_action_spaces,
+            actions=actions,
+            shared_embeddings=backward_shared_embeddings,
+        )
+        return forward_log_probs, backward_log_probs
+
+    def get_shared_embeddings(
+        self, states: List[ReactionState], action_spaces: List[ReactionActionSpace]
+    ) -> SharedEmbeddings:
+        all_molecules_reactions = self._get_molecules_reactions(action_spaces)
 
         molecule_and_reaction_to_idx = {
             molecule_reaction: idx for idx, molecule_reaction in enumerate(all_molecules_reactions)
         }
 
-        molecule_graphs = [
-            mol2graph(mol.rdkit_mol) for mol, _ in molecule_and_reaction_to_idx.keys()
-        ]
-        reaction_cond = [
-            one_hot(r.idx, len(self.anchored_reactions))
-            for _, r in molecule_and_reaction_to_idx.keys()
-        ]
-
-        graphs = molecule_graphs
-        conds = reaction_cond
+        graphs = []
+        for mol, _ in molecule_and_reaction_to_idx.keys():
+            graph = self._graph_cache.get(mol.smiles)
+            if graph is None:
+                graph = mol2graph(mol.rdkit_mol)
+                self._graph_cache[mol.smiles] = graph
+            graphs.append(graph)
 
         if len(graphs) == 0:
             return SharedEmbeddings(
                 molecule_and_reaction_to_idx=molecule_and_reaction_to_idx,
-                all_embeddings=torch.tensor([], dtype=torch.float).to(self.device),
+                all_embeddings=torch.empty(0, dtype=torch.float32, device=self.device),
             )
         graph_batch = mols2batch(graphs).to(self.device)
-        cond_batch = torch.tensor(conds).float().to(self.device)
+        reaction_indices = to_device_tensor(
+            [r.idx for _, r in molecule_and_reaction_to_idx.keys()],
+            dtype=torch.long,
+            device=self.device,
+        )
+        cond_batch = self._reaction_eye.index_select(0, reaction_indices)
 
-        embeddings = self.gnn(graph_batch, cond_batch)
+        with torch.autocast(
+            device_type="cuda",
+            dtype=torch.bfloat16,
+            enabled=self.use_bf16 and torch.device(self.device).type == "cuda",
+        ):
+            embeddings = self.gnn(graph_batch, cond_batch)
+        embeddings = embeddings.float()
         return SharedEmbeddings(
             molecule_and_reaction_to_idx=molecule_and_reaction_to_idx, all_embeddings=embeddings
         )
 
+    def clear_action_embedding_cache(self) -> None:
+        self._graph_cache.clear()
+
+    def on_end_computing_objective(
+        self, iteration_idx: int, trajectories: Trajectories, recursive: bool = True
+    ) -> Dict[str, Any]:
+        # the graphs are reused within a single iteration only, so that the cache does not grow with the run
+        self.clear_action_embedding_cache()
+        return super().on_end_computing_objective(iteration_idx, trajectories, recursive)
+
     def parameters(self, recurse: bool = True) -> Iterator[Parameter]:
         if not self.use_backbone:
             return super().parameters(recurse)
@@ -2,13 +2,12 @@ import abc
 import math
 from dataclasses import dataclass
 from functools import singledispatch
-from typing import Any, Callable, Dict, List, Sequence, Tuple, Type
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Type
 
 import gin
 import torch
 from rdkit import Chem
 from torch import nn
-from torch.distributions import Categorical
 from torch.nn import init
 from torchtyping import TensorType
 
@@ -47,11 +46,11 @@ from rgfn.gfns.reaction_gfn.policies.graph_transformer import (
 )
 from rgfn.gfns.reaction_gfn.policies.utils import (
     counts_to_batch_indices,
-    one_hot,
     to_dense_embeddings,
 )
 from rgfn.shared.policies.few_phase_policy import FewPhasePolicyBase, TSharedEmbeddings
 from rgfn.shared.policies.uniform_policy import TIndexedActionSpace
+from rgfn.utils.helpers import to_device_tensor
 
 
 @dataclass(frozen=True)
@@ -190,6 +189,10 @@ class ReactionForwardPolicy(
             else nn.Linear(hidden_dim, 1)
         )
 
+        self.register_buffer(
+            "_reaction_eye", torch.eye(len(self.anchored_reactions)), persistent=False
+        )
+
         self._action_space_type_to_forward_fn = {
             ReactionActionSpace0: self._forward_0,
             ReactionActionSpaceA: self._forward_a,
@@ -323,8 +326,11 @@ class ReactionForwardPolicy(
             ]
             embedding_indices_list.append(embedding_indices)
 
-        embedding_indices_flat = [idx for indices in embedding_indices_list for idx in indices]
-        embedding_indices = torch.tensor(embedding_indices_flat).long().to(self.device)
+        embedding_indices = to_device_tensor(
+            [idx for indices in embedding_indices_list for idx in indices],
+            dtype=torch.long,
+            device=self.device,
+        )
         embeddings = torch.index_select(
             shared_embeddings.all_embeddings, index=embedding_indices, dim=0
         )
@@ -345,10 +351,13 @@ class ReactionForwardPolicy(
         return torch.zeros((len(states), 1), device=self.device, dtype=torch.float32)
 
     def get_shared_embeddings(
-        self, states: List[ReactionState], action_spaces: List[ReactionActionSpace]
+        self,
+        states: List[ReactionState],
+        action_spaces: List[ReactionActionSpace],
+        extra_molecules_reactions: Iterable[Tuple[Molecule, Reaction]] = (),
     ) -> SharedEmbeddings:
         all_molecules = set()
-        all_molecules_reactions = set()
+        all_molecules_reactions = set(extra_molecules_reactions)
         for state, action_space in zip(states, action_spaces):
             if isinstance(action_space, ReactionActionSpace0):
                 all_molecules.add(None)
@@ -369,21 +378,19 @@ class ReactionForwardPolicy(
         molecule_graphs = [
             mol2graph(mol.rdkit_mol if mol else None) for mol in molecule_to_idx.keys()
         ]
-        reaction_cond = [one_hot(0, len(self.anchored_reactions))] * len(molecule_to_idx)
+        reaction_cond_indices = [0] * len(molecule_to_idx)
 
         molecule_and_reaction_graphs = [
             mol2graph(mol.rdkit_mol) for mol, _ in molecule_and_reaction_to_idx.keys()
         ]
-        molecule_and_reaction_cond = [
-            one_hot(r.idx, len(self.anchored_reactions))
-            for _, r in molecule_and_reaction_to_idx.keys()
-        ]
+        molecule_and_reaction_cond_indices = [r.idx for _, r in molecule_and_reaction_to_idx.keys()]
 
         graphs = molecule_graphs + molecule_and_reaction_graphs
-        conds = reaction_cond + molecule_and_reaction_cond
+        cond_indices = reaction_cond_indices + molecule_and_reaction_cond_indices
         if len(graphs) > 0:
             graph_batch = mols2batch(graphs).to(self.device)
-            cond_batch = torch.tensor(conds).float().to(self.device)
+            cond_indices = to_device_tensor(cond_indices, dtype=torch.long, device=self.device)
+            cond_batch = self._reaction_eye.index_select(0, cond_indices)
             embeddings = self.gnn(graph_batch, cond_batch)
         else:
             embeddings = None
@@ -4,7 +4,6 @@ from typing import Any, Callable, Dict, Iterator, List, Type
 import gin
 import torch
 from torch import nn
-from torch.distributions import Categorical
 from torch.nn import Parameter
 from torchtyping import TensorType
 
@@ -160,9 +159,10 @@ class ReactionForwardPolicyExploitationPenalty(
         Returns:
             the list of sampled actions.
         """
-        action_indices = Categorical(probs=logits).sample()  # logits are actually probabilities
+        # logits are actually probabilities
+        action_indices = torch.multinomial(logits, num_samples=1).squeeze(-1).tolist()
         return [
-            action_space.get_action_at_idx(idx.item())
+            action_space.get_action_at_idx(idx)
             for action_space, idx in zip(action_spaces, action_indices)
         ]
 
@@ -6,7 +6,6 @@ import gin
 import torch
 from rdkit import Chem
 from torch import Tensor, nn
-from torch.distributions import Categorical
 from torch.nn import Parameter
 from torchtyping import TensorType
 
@@ -42,9 +41,10 @@ from rgfn.gfns.reaction_gfn.policies.graph_transformer import (
     mol2graph,
     mols2batch,
 )
-from rgfn.gfns.reaction_gfn.policies.utils import one_hot, to_dense_embeddings
+from rgfn.gfns.reaction_gfn.policies.utils import to_dense_embeddings
 from rgfn.shared.policies.few_phase_policy import FewPhasePolicyBase, TSharedEmbeddings
 from rgfn.shared.policies.uniform_policy import TIndexedActionSpace
+from rgfn.utils.helpers import to_device_tensor
 
 
 @dataclass(frozen=True)
@@ -106,6 +106,10 @@ class RNDNoveltyForwardPolicy(
         self.target_mlp_c = _make_mlp(hidden_dim)
         self.predictor_mlp_c = _make_mlp(hidden_dim)
 
+        self.register_buffer(
+            "_reaction_eye", torch.eye(len(self.anchored_reactions)), persistent=False
+        )
+
         self._action_space_type_to_forward_fn = {
             ReactionActionSpace0: self._forward_0,
             ReactionActionSpaceA: self._forward_a,
@@ -360,22 +364,19 @@ class RNDNoveltyForwardPolicy(
         molecule_graphs = [
             mol2graph(mol.rdkit_mol if mol else None) for mol in molecule_to_idx.keys()
         ]
-        reaction_cond = [one_hot(0, len(self.anchored_reactions))] * len(molecule_to_idx)
-
         molecule_and_reaction_graphs = [
             mol2graph(mol.rdkit_mol) for mol, _ in molecule_and_reaction_to_idx.keys()
         ]
-        molecule_and_reaction_cond = [
-            one_hot(r.idx, len(self.anchored_reactions))
-            for _, r in molecule_and_reaction_to_idx.keys()
+        cond_indices = [0] * len(molecule_to_idx) + [
+            r.idx for _, r in molecule_and_reaction_to_idx.keys()
         ]
 
         graphs = molecule_graphs + molecule_and_reaction_graphs
-        conds = reaction_cond + molecule_and_reaction_cond
 
         if len(graphs) > 0:
             graph_batch = mols2batch(graphs).to(self.device)
-            cond_batch = torch.tensor(conds).float().to(self.device)
+            cond_indices = to_device_tensor(cond_indices, dtype=torch.long, device=self.device)
+            cond_batch = self._reaction_eye.index_select(0, cond_indices)
             target_embeddings = self.target_gnn(graph_batch, cond_batch).detach()
             predictor_embeddings = self.predictor_gnn(graph_batch, cond_batch)
         else:
@@ -427,13 +428,9 @@ class RNDNoveltyForwardPolicy(
         Returns:
             the log probabilities of the chosen actions of the shape (N,).
         """
-        action_indices = [
-            action_space.get_idx_of_action(action)  # type: ignore
-            for action_space, action in zip(action_spaces, actions)
-        ]
-        max_num_actions = logits.shape[1]
-        action_indices = [
-            idx * max_num_actions + action_idx for idx, action_idx in enumerate(action_indices)
-        ]
-        action_tensor_indices = torch.tensor(action_indices).long().to(self.device)
-        return torch.index_select(logits.view(-1), index=action_tensor_indices, dim=0)
+        action_indices = to_device_tensor(
+            type(action_spaces[0]).batch_get_idx_of_actions(action_spaces, actions),
+            dtype=torch.long,
+            device=self.device,
+        )
+        return logits.gather(1, action_indices.unsqueeze(1)).squeeze(1)
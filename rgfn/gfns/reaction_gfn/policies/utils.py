@@ -1,24 +1,27 @@
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, Sequence, Tuple
 
 import torch
 from torch_geometric.utils import to_dense_batch
 from torchtyping import TensorType
 
 from rgfn.gfns.reaction_gfn.api.data_structures import Molecule, Reaction
+from rgfn.utils.helpers import to_indices
 
 
-def counts_to_batch_indices(counts: Sequence[int], device: str | torch.device) -> torch.Tensor:
+def counts_to_batch_indices(
+    counts: Sequence[int], device: str | torch.device, output_size: int | None = None
+) -> torch.Tensor:
     counts = torch.tensor(counts, device=device) if not isinstance(counts, torch.Tensor) else counts
-    indices = torch.arange(len(counts), device=device)
-    batch = torch.repeat_interleave(indices, counts).long()  # e.g. [0, 0, 1, 1, 1, 2, 2, 2]
-    return batch
+    return to_indices(counts, output_size=output_size)  # e.g. [0, 0, 1, 1, 1, 2, 2, 2]
 
 
 def to_dense_embeddings(
     embeddings: torch.Tensor,
     counts: Sequence[int],
     fill_value: float = 0.0,
+    batch_size: int | None = None,
+    max_num_nodes: int | None = None,
 ) -> Tuple[torch.Tensor, torch.Tensor]:
     """
     Converts sparse node embeddings to dense node embeddings with padding.
@@ -26,20 +29,36 @@ def to_dense_embeddings(
         embeddings: embeddings in a sparse format, i.e. [total_num_nodes, hidden_size]
         counts: the number of nodes in each graph, i.e. [batch_size]
         fill_value: a value to fill the padding with
+        batch_size: the number of graphs. If None and `counts` is a list, it is computed on the host.
+        max_num_nodes: the maximal number of nodes in a graph. If None and `counts` is a list, it is computed on
+            the host. Providing both values avoids the device synchronization inside `to_dense_batch`.
 
     Returns:
         node_embeddings: embeddings in a dense format, i.e. [batch_size, max_num_nodes or max_num_edges, hidden_size]
         mask: a mask indicating which nodes are real and which are padding, i.e. [batch_size, max_num_nodes]
     """
-    batch = counts_to_batch_indices(counts, device=embeddings.device)
-    return to_dense_batch(
-        embeddings, batch, fill_value=fill_value
-    )  # that's the only reason we have torch_geometric in the requirements
-
-
-def one_hot(idx: int, num_classes: int) -> List[int]:
-    x = [0] * num_classes
-    if idx == -1:
-        return x
-    x[idx] = 1
-    return x
+    if not isinstance(counts, torch.Tensor):
+        batch_size = len(counts) if batch_size is None else batch_size
+        max_num_nodes = max(counts, default=0) if max_num_nodes is None else max_num_nodes
+    device = embeddings.device
+    counts = torch.as_tensor(counts, device=device)
+    batch = counts_to_batch_indices(counts, device=device, output_size=embeddings.shape[0])
+    if batch_size is None or max_num_nodes is None:
+        return to_dense_batch(
+            embeddings,
+            batch,
+            fill_value=fill_value,
+            batch_size=batch_size,
+            max_num_nodes=max_num_nodes,
+        )  # that's the only reason we have torch_geometric in the requirements
+
+    # the shapes are known, so we can scatter the embeddings into a padded tensor without a device sync
+    offsets = torch.cumsum(counts, dim=0) - counts
+    positions = torch.arange(len(embeddings), device=device) - offsets[batch]
+    dense_embeddings = embeddings.new_full(
+        (batch_size, max_num_nodes) + embeddings.shape[1:], fill_value
+    )
+    dense_embeddings[batch, positions] = embeddings
+    mask = torch.zeros((batch_size, max_num_nodes), dtype=torch.bool, device=device)
+    mask[batch, positions] = True
+    return dense_embeddings, mask
@@ -1,8 +1,8 @@
-from typing import Generic, Iterator
+from typing import Generic, Iterator, Tuple
 
 import gin
 import torch
-from torch import nn
+from torch import Tensor, nn
 from torch.nn import Parameter
 from torchtyping import TensorType
 
@@ -12,6 +12,25 @@ from rgfn.api.trajectories import Trajectories
 from rgfn.api.type_variables import TAction, TActionSpace, TState
 
 
+@torch.jit.script
+def _tb_loss(
+    source_log_flow: Tensor,
+    log_reward: Tensor,
+    forward_log_prob: Tensor,
+    backward_log_prob: Tensor,
+    index: Tensor,
+) -> Tuple[Tensor, Tensor, Tensor]:
+    loss = torch.scatter_add(
+        input=source_log_flow - log_reward,
+        index=index,
+        src=forward_log_prob - backward_log_prob,
+        dim=0,
+    )  # [n_trajectories]
+    loss = loss.pow(2).mean()
+    detached_log_flow = source_log_flow.detach()
+    return loss, detached_log_flow.mean(), detached_log_flow.abs().mean()
+
+
 @gin.configurable()
 class ConditionedTrajectoryBalanceObjective(ObjectiveBase[TState, TActionSpace, TAction]):
     def compute_objective_output(
@@ -24,19 +43,15 @@ class ConditionedTrajectoryBalanceObjective(ObjectiveBase[TState, TActionSpace,
         forward_log_prob = trajectories.get_forward_log_probs_flat()  # [n_actions]
         backward_log_prob = trajectories.get_backward_log_probs_flat()  # [n_actions]
         log_reward = trajectories.get_reward_outputs().log_reward  # [n_trajectories]
-        index = trajectories.get_index_flat().to(self.device)  # [n_actions]
-
-        loss = torch.scatter_add(
-            input=source_log_flow - log_reward,
-            index=index,
-            src=forward_log_prob - backward_log_prob,
-            dim=0,
-        )  # [n_trajectories]
-        loss = loss.pow(2).mean()
+        index = trajectories.get_index_flat(device=self.device)  # [n_actions]
+
+        loss, mean_log_flow, abs_mean_log_flow = _tb_loss(
+            source_log_flow, log_reward, forward_log_prob, backward_log_prob, index
+        )
         return ObjectiveOutput(
             loss=loss,
             metrics={
-                "mean_log_flow": source_log_flow.mean().item(),
-                "abs_mean_log_flow": source_log_flow.abs().mean().item(),
+                "mean_log_flow": mean_log_flow,
+                "abs_mean_log_flow": abs_mean_log_flow,
             },
         )
@@ -53,7 +53,7 @@ class SubTrajectoryBalanceObjective(ObjectiveBase[TState, TActionSpace, TAction]
         backward_log_prob = trajectories.get_backward_log_probs_flat()  # [n_actions]
         log_flow = trajectories.get_log_flows_flat()  # [n_actions]
         log_reward = trajectories.get_reward_outputs().log_reward  # [n_trajectories]
-        index = trajectories.get_index_flat().to(self.device)  # [n_actions]
+        index = trajectories.get_index_flat(device=self.device)  # [n_actions]
 
         log_prob_diff = forward_log_prob - backward_log_prob  # [n_actions]
         log_prob_diff, action_mask = to_dense_batch(
@@ -52,7 +52,7 @@ class TrajectoryBalanceObjective(ObjectiveBase[TState, TActionSpace, TAction]):
         forward_log_prob = trajectories.get_forward_log_probs_flat()  # [n_actions]
         backward_log_prob = trajectories.get_backward_log_probs_flat()  # [n_actions]
         log_reward = trajectories.get_reward_outputs().log_reward  # [n_trajectories]
-        index = trajectories.get_index_flat().to(self.device)  # [n_actions]
+        index = trajectories.get_index_flat(device=self.device)  # [n_actions]
 
         loss = torch.scatter_add(
             input=self.logZ.sum() - log_reward,
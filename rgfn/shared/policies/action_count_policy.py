@@ -2,7 +2,6 @@ from typing import Dict, Hashable, List, TypeVar
 
 import gin
 import torch
-from torch.distributions import Categorical
 from torchtyping import TensorType
 
 from rgfn.api.policy_base import PolicyBase
@@ -47,9 +46,11 @@ class ActionCountPolicy(PolicyBase[TState, TIndexedActionSpace, THashableAction]
         self, states: List[TState], action_spaces: List[TIndexedActionSpace]
     ) -> List[THashableAction]:
         log_probs = self._forward(action_spaces)
-        action_indices = Categorical(probs=torch.exp(log_probs)).sample()
+        # Gumbel-max trick on the log probabilities, so no exp or renormalization is needed
+        gumbel_noise = -torch.empty_like(log_probs).exponential_().log()
+        action_indices = (log_probs + gumbel_noise).argmax(dim=1).tolist()
         return [
-            action_space.get_action_at_idx(idx.item())
+            action_space.get_action_at_idx(idx)
             for action_space, idx in zip(action_spaces, action_indices)
         ]
 
@@ -3,7 +3,6 @@ from typing import Dict, Hashable, List, Tuple, TypeVar
 import gin
 import numpy as np
 import torch
-from torch.distributions import Categorical
 from torchtyping import TensorType
 
 from rgfn.api.policy_base import PolicyBase
@@ -1,10 +1,10 @@
 import abc
-from functools import singledispatch
+from functools import cached_property, singledispatch
 from typing import Any, Callable, Dict, Generic, List, Sequence, Tuple, Type, TypeVar
 
+import numpy as np
 import torch
 from torch import nn
-from torch.distributions import Categorical
 from torchtyping import TensorType
 
 from rgfn.api.policy_base import PolicyBase
@@ -12,6 +12,7 @@ from rgfn.api.trajectories import Trajectories
 from rgfn.api.type_variables import TAction, TState
 from rgfn.shared.policies.uniform_policy import TIndexedActionSpace
 from rgfn.shared.proxies.cached_proxy import THashableState
+from rgfn.utils.helpers import to_device_tensor
 
 TSharedEmbeddings = TypeVar("TSharedEmbeddings")
 
@@ -25,6 +26,7 @@ class FewPhasePolicyBase(
     def __init__(self):
         super().__init__()
         self.device = "cpu"
+        self._action_space_type_cache: Dict[Type, Type | None] = {}
 
     @abc.abstractmethod
     def get_shared_embeddings(
@@ -44,19 +46,67 @@ class FewPhasePolicyBase(
     ]:
         ...
 
+    @cached_property
+    def _forward_items(
+        self,
+    ) -> Tuple[Tuple[Type[TIndexedActionSpace], Callable[..., TensorType[float]]], ...]:
+        """
+        The items of `action_space_to_forward_fn` frozen on the first access, so the dispatch order is fixed.
+        """
+        return tuple(self.action_space_to_forward_fn.items())
+
+    def _resolve_action_space_type(self, action_space_type: Type) -> Type | None:
+        """
+        Resolve the type of the action space to the matching key of `action_space_to_forward_fn`. The results are
+        cached, so subclasses of the keys are resolved only once.
+        """
+        if action_space_type not in self._action_space_type_cache:
+            self._action_space_type_cache[action_space_type] = next(
+                (key for key, _ in self._forward_items if issubclass(action_space_type, key)),
+                None,
+            )
+        return self._action_space_type_cache[action_space_type]
+
+    def _group_indices_by_action_space_type(
+        self, action_spaces: List[TIndexedActionSpace]
+    ) -> Dict[Type[TIndexedActionSpace], List[int]]:
+        """
+        Group the indices of the action spaces by the matching key of `action_space_to_forward_fn` in a single pass.
+        """
+        type_to_indices: Dict[Type[TIndexedActionSpace], List[int]] = {
+            key: [] for key, _ in self._forward_items
+        }
+        for idx, action_space in enumerate(action_spaces):
+            action_space_type = self._resolve_action_space_type(type(action_space))
+            if action_space_type is not None:
+                type_to_indices[action_space_type].append(idx)
+        return type_to_indices
+
+    @staticmethod
+    def _invert_permutation(phase_indices_list: List[List[int]]) -> np.ndarray:
+        """
+        Computes the inverse of the permutation given by the concatenated phase indices with a single numpy scatter.
+        """
+        action_to_state_idx = np.concatenate(
+            [np.asarray(phase_indices, dtype=np.int64) for phase_indices in phase_indices_list]
+            or [np.empty(0, dtype=np.int64)]
+        )
+        state_to_action_idx = np.empty_like(action_to_state_idx)
+        state_to_action_idx[action_to_state_idx] = np.arange(
+            len(action_to_state_idx), dtype=np.int64
+        )
+        return state_to_action_idx
+
     def sample_actions(
         self, states: List[THashableState], action_spaces: List[TIndexedActionSpace]
     ) -> List[TAction]:
         shared_embeddings = self.get_shared_embeddings(states, action_spaces)
+        type_to_indices = self._group_indices_by_action_space_type(action_spaces)
 
         actions = []
-        action_to_state_idx = []
-        for action_space_type, forward_fn in self.action_space_to_forward_fn.items():
-            phase_indices = [
-                idx
-                for idx, action_space in enumerate(action_spaces)
-                if isinstance(action_space, action_space_type)
-            ]
+        phase_indices_list = []
+        for action_space_type, forward_fn in self._forward_items:
+            phase_indices = type_to_indices[action_space_type]
             if len(phase_indices) == 0:
                 continue
             phase_states = [states[idx] for idx in phase_indices]
@@ -65,13 +115,10 @@ class FewPhasePolicyBase(
 
             phase_actions = self._sample_actions_from_logits(logits, phase_action_spaces)
             actions.extend(phase_actions)
-            action_to_state_idx.extend(phase_indices)
+            phase_indices_list.append(phase_indices)
 
-        state_to_action_idx = [0] * len(states)
-        for action_idx, state_idx in enumerate(action_to_state_idx):
-            state_to_action_idx[state_idx] = action_idx
-
-        return [actions[state_to_action_idx[state_idx]] for state_idx in range(len(states))]
+        state_to_action_idx = self._invert_permutation(phase_indices_list)
+        return [actions[action_idx] for action_idx in state_to_action_idx.tolist()]
 
     def _sample_actions_from_logits(
         self, logits: TensorType[float], action_spaces: List[TIndexedActionSpace]
@@ -86,10 +133,11 @@ class FewPhasePolicyBase(
         Returns:
             the list of sampled actions.
         """
-        probs = torch.softmax(logits, dim=1)
-        action_indices = Categorical(probs=probs).sample()
+        # Gumbel-max trick: argmax(logits + Gumbel noise) is a sample from softmax(logits)
+        gumbel_noise = -torch.empty_like(logits).exponential_().log()
+        action_indices = (logits + gumbel_noise).argmax(dim=1).tolist()
         return [
-            action_space.get_action_at_idx(idx.item())
+            action_space.get_action_at_idx(idx)
             for action_space, idx in zip(action_spaces, action_indices)
         ]
 
@@ -98,17 +146,18 @@ class FewPhasePolicyBase(
         states: List[TState],
         action_spaces: List[TIndexedActionSpace],
         actions: List[TAction],
+        shared_embeddings: TSharedEmbeddings | None = None,
     ) -> TensorType[float]:
-        shared_embeddings = self.get_shared_embeddings(states, action_spaces)
+        if shared_embeddings is None:
+            shared_embeddings = self.get_shared_embeddings(states, action_spaces)
 
-        log_probs_list = []
-        log_probs_to_state_idx = []
-        for action_space_type, forward_fn in self.action_space_to_forward_fn.items():
-            phase_indices = [
-                idx
-                for idx, action_space in enumerate(action_spaces)
-                if isinstance(action_space, action_space_type)
-            ]
+        type_to_indices = self._group_indices_by_action_space_type(action_spaces)
+
+        log_probs = torch.empty(len(states), dtype=torch.float32, device=self.device)
+        offset = 0
+        phase_indices_list = []
+        for action_space_type, forward_fn in self._forward_items:
+            phase_indices = type_to_indices[action_space_type]
             if len(phase_indices) == 0:
                 continue
 
@@ -121,16 +170,15 @@ class FewPhasePolicyBase(
             phase_log_probs = self._select_actions_log_probs(
                 logits, phase_action_spaces, phase_actions
             )
-            log_probs_list.append(phase_log_probs)
-            log_probs_to_state_idx.extend(phase_indices)
+            log_probs[offset : offset + len(phase_indices)] = phase_log_probs
+            offset += len(phase_indices)
+            phase_indices_list.append(phase_indices)
 
-        log_probs = torch.cat(log_probs_list, dim=0)
-        state_to_action_idx = torch.empty(len(states), dtype=torch.long)
-        for action_idx, state_idx in enumerate(log_probs_to_state_idx):
-            state_to_action_idx[state_idx] = action_idx
-        state_to_action_idx = state_to_action_idx.to(self.device)
+        state_to_action_idx = to_device_tensor(
+            self._invert_permutation(phase_indices_list), dtype=torch.long, device=self.device
+        )
 
-        return torch.index_select(log_probs, index=state_to_action_idx, dim=0).to(self.device)
+        return torch.index_select(log_probs, index=state_to_action_idx, dim=0)
 
     def _select_actions_log_probs(
         self,
@@ -149,18 +197,13 @@ class FewPhasePolicyBase(
         Returns:
             the log probabilities of the chosen actions of the shape (N,).
         """
-        action_indices = [
-            action_space.get_idx_of_action(action)  # type: ignore
-            for action_space, action in zip(action_spaces, actions)
-        ]
-        max_num_actions = logits.shape[1]
-        action_indices = [
-            idx * max_num_actions + action_idx for idx, action_idx in enumerate(action_indices)
-        ]
-        action_tensor_indices = torch.tensor(action_indices).long().to(self.device)
-
+        action_indices = to_device_tensor(
+            type(action_spaces[0]).batch_get_idx_of_actions(action_spaces, actions),
+            dtype=torch.long,
+            device=self.device,
+        )
         log_probs = torch.log_softmax(logits, dim=1)
-        return torch.index_select(log_probs.view(-1), index=action_tensor_indices, dim=0)
+        return log_probs.gather(1, action_indices.unsqueeze(1)).squeeze(1)
 
     def compute_states_log_flow(self, states: List[THashableState]) -> TensorType[float]:
         raise NotImplementedError()
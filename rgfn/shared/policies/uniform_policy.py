@@ -1,8 +1,9 @@
 import abc
 import random
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Sequence, TypeVar
 
 import gin
+import numpy as np
 import torch
 from torchtyping import TensorType
 
@@ -29,6 +30,30 @@ class IndexedActionSpaceBase(abc.ABC, Generic[TAction]):
     def get_possible_actions_indices(self) -> List[int]:
         pass
 
+    @classmethod
+    def batch_get_idx_of_actions(
+        cls, action_spaces: Sequence["IndexedActionSpaceBase"], actions: Sequence[TAction]
+    ) -> np.ndarray:
+        """
+        Get the indices of the actions in the corresponding action spaces of this type. Subclasses can override it
+        with a vectorized implementation.
+
+        Args:
+            action_spaces: a sequence of action spaces of this type.
+            actions: a sequence of actions of the same length as `action_spaces`.
+
+        Returns:
+            an int64 array of the action indices.
+        """
+        return np.fromiter(
+            (
+                action_space.get_idx_of_action(action)
+                for action_space, action in zip(action_spaces, actions)
+            ),
+            dtype=np.int64,
+            count=len(actions),
+        )
+
     def is_empty(self) -> bool:
         return len(self) == 0
 
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from itertools import chain
 from typing import Any, List, Literal, Sequence
 
 from rgfn.api.trajectories import Trajectories
@@ -31,5 +32,8 @@ class ArtifactsList:
         self.artifacts = artifacts
 
     def compute_artifacts(self, trajectories: Trajectories) -> List[ArtifactOutput]:
-        artifacts_list = [artifact.compute_artifacts(trajectories) for artifact in self.artifacts]
-        return [artifact for artifacts in artifacts_list for artifact in artifacts]
+        return list(
+            chain.from_iterable(
+                artifact.compute_artifacts(trajectories) for artifact in self.artifacts
+            )
+        )
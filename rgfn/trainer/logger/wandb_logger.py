@@ -1,6 +1,7 @@
 import pickle
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 import gin
 import wandb
@@ -28,6 +29,8 @@ class WandbLogger(LoggerBase):
         self.experiment_name = experiment_name
         self.kwargs = kwargs
         self.run = self._init_run()
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._io_futures: List[Future] = []
 
     def _init_run(self):
         group_list = self.experiment_name.split("/")
@@ -57,25 +60,46 @@ class WandbLogger(LoggerBase):
         else:
             raise ValueError(f"Unknown type {type}")
 
+        # the content is serialized on the calling thread, so later changes to it are not logged
         if type in ["json", "txt"]:
-            with open(config_path, "w") as f:
-                f.write(content)
-        elif type == "to_pickle":
-            with open(config_path, "wb") as f:
-                pickle.dump(content, f)
-
-        self.run.save(str(config_path))
+            data, mode = content, "w"
+        else:
+            data, mode = pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL), "wb"
+        self._submit_io(self._write_and_save, config_path, data, mode)
+
+    def _submit_io(self, fn: Callable[..., Any], *args: Any):
+        pending_futures, done_futures = [], []
+        for future in self._io_futures:
+            (done_futures if future.done() else pending_futures).append(future)
+        self._io_futures = pending_futures + [self._io_pool.submit(fn, *args)]
+        for future in done_futures:
+            future.result()  # re-raises the error of a failed write, so it is not lost
+
+    def _wait_for_io(self):
+        futures, self._io_futures = self._io_futures, []
+        self._io_pool.shutdown(wait=True)
+        for future in futures:
+            future.result()
+
+    def _write_and_save(self, path: Path, data: str | bytes, mode: str):
+        with open(path, mode) as f:
+            f.write(data)
+        self.run.save(str(path))
 
     def log_config(self, config: Dict[str, Any]):
         self.run.config.update(config)
 
     def log_files(self, file_paths: List[Path | str]):
         for file_path in file_paths:
-            self.run.save(str(file_path))
+            self._submit_io(self.run.save, str(file_path))
 
     def close(self):
-        self.run.finish()
+        try:
+            self._wait_for_io()
+        finally:
+            self.run.finish()
 
     def restart(self):
         self.close()
         self.run = self._init_run()
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
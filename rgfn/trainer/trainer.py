@@ -1,6 +1,7 @@
 import abc
+import itertools
 from pathlib import Path
-from typing import Any, Dict, Generic, List, Literal, Optional, Sequence
+from typing import Any, Dict, Generic, Iterable, List, Literal, Optional, Sequence
 
 import gin
 import torch
@@ -179,31 +180,34 @@ class Trainer(Generic[TState, TActionSpace, TAction], TrainingHooksMixin):
         Returns:
             a `Trajectories` object containing the training trajectories.
         """
-        trajectories_list = []
+        # the replay batches are sampled before the forward trajectories are added to the replay buffer
+        replay_batches: Iterable[Trajectories] = []
         if self.train_replay_buffer and self.train_replay_n_trajectories > 0:
-            for trajectories in self.train_replay_buffer.get_trajectories_iterator(
-                n_total_trajectories=self.train_replay_n_trajectories,
-                batch_size=self.train_batch_size,
-            ):
-                trajectories_list.append(trajectories)
+            replay_batches = list(
+                self.train_replay_buffer.get_trajectories_iterator(
+                    n_total_trajectories=self.train_replay_n_trajectories,
+                    batch_size=self.train_batch_size,
+                )
+            )
+        forward_batches: Iterable[Trajectories] = []
         if self.train_forward_sampler and self.train_forward_n_trajectories > 0:
-            forward_trajectories_list = []
-            for trajectories in self.train_forward_sampler.get_trajectories_iterator(
-                self.train_forward_n_trajectories, self.train_batch_size
-            ):
-                forward_trajectories_list.append(trajectories)
-            forward_trajectories = Trajectories.from_trajectories(forward_trajectories_list)
-            trajectories_list.append(forward_trajectories)
+            forward_trajectories = Trajectories.from_trajectories(
+                self.train_forward_sampler.get_trajectories_iterator(
+                    self.train_forward_n_trajectories, self.train_batch_size
+                )
+            )
+            forward_batches = [forward_trajectories]
             if self.train_replay_buffer:
                 self.train_replay_buffer.add_trajectories(forward_trajectories)
+        backward_batches: Iterable[Trajectories] = []
         if self.train_backward_sampler and self.train_backward_n_trajectories > 0:
-            for trajectories in self.train_backward_sampler.get_trajectories_iterator(
+            backward_batches = self.train_backward_sampler.get_trajectories_iterator(
                 self.train_backward_n_trajectories, self.train_batch_size
-            ):
-                trajectories_list.append(trajectories)
+            )
 
-        trajectories = Trajectories.from_trajectories(trajectories_list)
-        return trajectories
+        return Trajectories.from_trajectories(
+            itertools.chain(replay_batches, forward_batches, backward_batches)
+        )
 
     @torch.no_grad()
     def valid_step(self) -> Dict[str, float]:
@@ -225,7 +229,7 @@ class Trainer(Generic[TState, TActionSpace, TAction], TrainingHooksMixin):
             metrics = (
                 self.valid_metrics.compute_metrics(trajectories=trajectories)
                 | {"loss": objective.loss.item()}
-                | objective.metrics
+                | objective.get_float_metrics()
             )
             metrics_list.append(metrics)
             trajectories.set_device("cpu")
@@ -298,7 +302,7 @@ class Trainer(Generic[TState, TActionSpace, TAction], TrainingHooksMixin):
             metrics = (
                 self.train_metrics.compute_metrics(trajectories=trajectories)
                 | {"loss": objective.loss.item()}
-                | objective.metrics
+                | objective.get_float_metrics()
                 | hook_update_dict
             )
             self.logger.log_metrics(metrics=metrics, prefix="train")
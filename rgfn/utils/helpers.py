@@ -1,17 +1,34 @@
 import heapq
+import os
 import random
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Hashable, Iterator, List, Literal, Set
-
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    Literal,
+    Sequence,
+    TypeVar,
+)
+
+import gin
 import numpy as np
 import torch
 from torchtyping import TensorType
 
+TKey = TypeVar("TKey", bound=Hashable)
+TValue = TypeVar("TValue")
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ComparableTuple:
     value: float
     item: Hashable
+    key: int = 0
 
     def __lt__(self, other: "ComparableTuple") -> bool:
         return self.value < other.value
@@ -26,28 +43,91 @@ class ContentHeap:
     def __init__(self, max_size: int) -> None:
         self.max_size = max_size
         self.heap: List[ComparableTuple] = []
-        self.items: Set[Any] = set()
+        # maps the hashes of the items in the heap to the items, so the equality is checked only on a hash match
+        self.items: Dict[int, List[Hashable]] = {}
 
     def __len__(self) -> int:
         return len(self.heap)
 
     def push(self, value: float, item: Hashable) -> None:
-        if item in self.items:
+        key = hash(item)
+        same_key_items = self.items.setdefault(key, [])
+        if item in same_key_items:
             return None
-        self.items.add(item)
+        same_key_items.append(item)
         if len(self.heap) < self.max_size:
-            heapq.heappush(self.heap, ComparableTuple(value, item))
+            heapq.heappush(self.heap, ComparableTuple(value, item, key))
         else:
-            t = heapq.heappushpop(self.heap, ComparableTuple(value, item))
-            self.items.remove(t.item)
+            t = heapq.heappushpop(self.heap, ComparableTuple(value, item, key))
+            evicted_key_items = self.items[t.key]
+            evicted_key_items.remove(t.item)
+            if len(evicted_key_items) == 0:
+                del self.items[t.key]
 
     def __iter__(self) -> Iterator[ComparableTuple]:
         return iter(self.heap)
 
 
-def to_indices(counts: TensorType[int]) -> TensorType[int]:
+class Cache(Generic[TKey, TValue]):
+    """
+    A dictionary-based LRU cache with a bounded size. When the cache exceeds `max_size`, the least recently used
+    entry is evicted.
+    """
+
+    def __init__(self, max_size: int = 1_000_000) -> None:
+        self.max_size = max_size
+        self._cache: OrderedDict[TKey, TValue] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, key: TKey) -> bool:
+        return key in self._cache
+
+    def __getitem__(self, key: TKey) -> TValue:
+        value = self._cache[key]
+        self._cache.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: TKey, value: TValue) -> None:
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def get(self, key: TKey, default: TValue | None = None) -> TValue | None:
+        if key not in self._cache:
+            return default
+        return self[key]
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+def to_indices(counts: TensorType[int], output_size: int | None = None) -> TensorType[int]:
     indices = torch.arange(len(counts), device=counts.device)
-    return torch.repeat_interleave(indices, counts).long()
+    # passing output_size (the sum of counts) avoids a device sync to compute it
+    return torch.repeat_interleave(indices, counts, output_size=output_size).long()
+
+
+def to_device_tensor(
+    values: Sequence[int] | Sequence[float] | np.ndarray,
+    dtype: torch.dtype,
+    device: str | torch.device,
+) -> torch.Tensor:
+    """
+    Creates a tensor from a list of python values or a numpy array on the given device. For CUDA devices, the values
+    are staged in pinned host memory and copied asynchronously, so the copy does not block the host.
+    """
+    is_cuda = torch.device(device).type == "cuda"
+    if isinstance(values, np.ndarray):
+        tensor = torch.from_numpy(values).to(dtype)
+        if not is_cuda:
+            return tensor.to(device)
+        return tensor.pin_memory().to(device, non_blocking=True)
+    if not is_cuda:
+        return torch.as_tensor(values, dtype=dtype, device=device)
+    return torch.tensor(values, dtype=dtype, pin_memory=True).to(device, non_blocking=True)
 
 
 def dict_mean(dict_list: List[Dict[str, float]]) -> Dict[str, float]:
@@ -70,14 +150,26 @@ def infer_metric_direction(metric_name: str) -> Literal["min", "max"]:
         raise ValueError(f"Unknown metric name: {metric_name}")
 
 
-def seed_everything(seed: int):
+@gin.configurable(denylist=["seed"])
+def seed_everything(seed: int, deterministic: bool | None = None):
     r"""Sets the seed for generating random numbers in :pytorch:`PyTorch`,
     :obj:`numpy` and Python.
 
     Args:
         seed (int): The desired seed.
+        deterministic (bool | None): Whether to force deterministic algorithms. If False, cuDNN benchmark mode is
+            enabled and faster non-deterministic kernels are allowed. If None, the global PyTorch flags are left
+            untouched. In the deterministic mode, `CUBLAS_WORKSPACE_CONFIG` is set as well. cuBLAS reads it only
+            once when it is initialized, so the function should be called before any CUDA computation.
     """
     random.seed(seed)
     np.random.seed(seed)
     torch.manual_seed(seed)
     torch.cuda.manual_seed_all(seed)
+    if deterministic is None:
+        return
+    if deterministic:
+        os.environ.setdefault("CUBLAS_WORKSPACE_CONFIG", ":4096:8")
+    torch.use_deterministic_algorithms(deterministic)
+    torch.backends.cudnn.deterministic = deterministic
+    torch.backends.cudnn.benchmark = not deterministic
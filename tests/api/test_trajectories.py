@@ -175,6 +175,23 @@ def test__trajectories_from_trajectories():
     assert torch.equal(trajectories.get_index_flat(), torch.tensor([0, 0, 0, 1, 1, 2, 2, 3]))
 
 
+def test__trajectories_from_trajectories_generator():
+    def _trajectories_iterator():
+        for i in range(3):
+            t = Trajectories()
+            t._states_list = [[i, i]]
+            t._forward_action_spaces_list = [[i]]
+            t._backward_action_spaces_list = [[i]]
+            t._actions_list = [[i]]
+            t._forward_log_probs_flat = torch.tensor([i])
+            yield t
+
+    trajectories = Trajectories.from_trajectories(_trajectories_iterator())
+    assert trajectories.get_actions_flat() == [0, 1, 2]
+    assert trajectories.get_last_states_flat() == [0, 1, 2]
+    assert torch.equal(trajectories.get_forward_log_probs_flat(), torch.tensor([0, 1, 2]))
+
+
 def test__trajectories_scatter_add():
     trajectories = Trajectories()
     trajectories._states_list = [[0, 0, 0, 0], [1, 1, 1]]
@@ -73,3 +73,14 @@ def rgfn_backward_policy(
     return ReactionBackwardPolicy(
         data_factory=rgfn_data_factory,
     )
+
+
+@pytest.fixture(scope="module")
+def rgfn_backward_policy_with_backbone(
+    rgfn_data_factory: ReactionDataFactory,
+    rgfn_forward_policy: ReactionForwardPolicy,
+) -> ReactionBackwardPolicy:
+    return ReactionBackwardPolicy(
+        data_factory=rgfn_data_factory,
+        backbone_policy=rgfn_forward_policy,
+    )
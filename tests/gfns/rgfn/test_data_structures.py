@@ -0,0 +1,39 @@
+import pytest
+
+from rgfn.gfns.reaction_gfn.api.data_structures import _MOL_CACHE, Molecule
+
+
+@pytest.mark.parametrize(
+    "smiles",
+    [
+        ["CCO"],
+        ["CCO", "OCC", "c1ccccc1", "CCO"],
+        ["CC(=O)O", "C1CC", "N#N", "C1CC"],
+    ],
+)
+@pytest.mark.parametrize("with_indices", [False, True])
+def test__molecule__from_smiles_batch_matches_molecule(smiles: list, with_indices: bool):
+    indices = list(range(len(smiles))) if with_indices else None
+
+    _MOL_CACHE.clear()
+    batch_molecules = Molecule.from_smiles_batch(smiles, indices)
+    _MOL_CACHE.clear()
+    expected_molecules = [
+        Molecule(s, idx=idx) for s, idx in zip(smiles, indices or [None] * len(smiles))
+    ]
+
+    assert len(batch_molecules) == len(expected_molecules)
+    for molecule, expected_molecule in zip(batch_molecules, expected_molecules):
+        assert molecule == expected_molecule
+        assert molecule.smiles == expected_molecule.smiles
+        assert molecule.idx == expected_molecule.idx
+        assert molecule.valid == expected_molecule.valid
+        assert (molecule.rdkit_mol is None) == (expected_molecule.rdkit_mol is None)
+
+
+def test__molecule__from_smiles_batch_uses_cache():
+    _MOL_CACHE.clear()
+    expected_molecule = Molecule("CCO")
+    (molecule,) = Molecule.from_smiles_batch(["CCO"])
+
+    assert molecule.rdkit_mol is expected_molecule.rdkit_mol
@@ -0,0 +1,45 @@
+import pytest
+import torch
+from torch_geometric.utils import to_dense_batch
+
+from rgfn.gfns.reaction_gfn.policies.utils import (
+    counts_to_batch_indices,
+    to_dense_embeddings,
+)
+
+
+@pytest.mark.parametrize("counts", [[1], [3, 1, 2], [2, 0, 4, 1], [0, 0, 5]])
+@pytest.mark.parametrize("fill_value", [0.0, float("-inf")])
+def test__to_dense_embeddings__matches_to_dense_batch(counts, fill_value: float):
+    torch.manual_seed(42)
+    embeddings = torch.randn(sum(counts), 8)
+    batch = counts_to_batch_indices(counts, device="cpu")
+    expected_embeddings, expected_mask = to_dense_batch(
+        embeddings, batch, fill_value=fill_value, batch_size=len(counts)
+    )
+
+    dense_embeddings, mask = to_dense_embeddings(embeddings, counts, fill_value=fill_value)
+
+    assert torch.equal(dense_embeddings, expected_embeddings)
+    assert torch.equal(mask, expected_mask)
+
+
+def test__to_dense_embeddings__tensor_counts_match_list_counts():
+    torch.manual_seed(42)
+    counts = [2, 0, 3]
+    embeddings = torch.randn(sum(counts), 4)
+
+    dense_embeddings, mask = to_dense_embeddings(embeddings, counts)
+    expected_embeddings, expected_mask = to_dense_embeddings(embeddings, torch.tensor(counts))
+
+    assert torch.equal(dense_embeddings, expected_embeddings)
+    assert torch.equal(mask, expected_mask)
+
+
+def test__to_dense_embeddings__propagates_gradients():
+    embeddings = torch.randn(5, 4, requires_grad=True)
+
+    dense_embeddings, _ = to_dense_embeddings(embeddings, [2, 3])
+    dense_embeddings.sum().backward()
+
+    assert torch.equal(embeddings.grad, torch.ones_like(embeddings))
@@ -0,0 +1,39 @@
+from collections import defaultdict
+
+from rgfn import RandomSampler, UniformPolicy
+from rgfn.gfns.reaction_gfn.api.reaction_api import (
+    ReactionActionSpace0,
+    ReactionActionSpaceA,
+)
+from rgfn.utils.helpers import seed_everything
+
+from .fixtures import *
+
+
+@pytest.mark.parametrize("n_trajectories", [1, 10])
+def test__reaction_action_spaces__batch_get_idx_of_actions_matches_get_idx_of_action(
+    rgfn_env: ReactionEnv, n_trajectories: int
+):
+    seed_everything(42)
+    sampler = RandomSampler(policy=UniformPolicy(), env=rgfn_env, reward=None)
+    trajectories = sampler.sample_trajectories(n_trajectories=n_trajectories)
+    actions = trajectories.get_actions_flat()
+    action_spaces = (
+        trajectories.get_forward_action_spaces_flat()
+        + trajectories.get_backward_action_spaces_flat()
+    )
+
+    type_to_pairs = defaultdict(list)
+    for action_space, action in zip(action_spaces, actions + actions):
+        type_to_pairs[type(action_space)].append((action_space, action))
+    assert ReactionActionSpace0 in type_to_pairs
+    assert ReactionActionSpaceA in type_to_pairs
+
+    for action_space_type, pairs in type_to_pairs.items():
+        type_action_spaces, type_actions = zip(*pairs)
+        indices = action_space_type.batch_get_idx_of_actions(type_action_spaces, type_actions)
+        expected_indices = [
+            action_space.get_idx_of_action(action)
+            for action_space, action in zip(type_action_spaces, type_actions)
+        ]
+        assert indices.tolist() == expected_indices
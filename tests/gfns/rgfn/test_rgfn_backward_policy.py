@@ -1,4 +1,5 @@
 # can return sensible log probs for any trajectory
+import torch
 from gfns.helpers.policy_test_helpers import (
     helper__test_backward_policy__returns_sensible_log_probs,
     helper__test_backward_policy__samples_only_allowed_actions,
@@ -6,12 +7,14 @@ from gfns.helpers.policy_test_helpers import (
     helper__test_forward_policy__samples_only_allowed_actions,
 )
 
+from rgfn import RandomSampler, UniformPolicy
 from rgfn.gfns.reaction_gfn.policies.reaction_backward_policy import (
     ReactionBackwardPolicy,
 )
 from rgfn.gfns.reaction_gfn.policies.reaction_forward_policy import (
     ReactionForwardPolicy,
 )
+from rgfn.utils.helpers import seed_everything
 
 from .fixtures import *
 
@@ -32,3 +35,54 @@ def test__rgfn_backward_policy__returns_sensible_log_probs(
     helper__test_backward_policy__returns_sensible_log_probs(
         rgfn_backward_policy, rgfn_env, n_trajectories
     )
+
+
+@pytest.mark.parametrize("n_trajectories", [1, 10])
+def test__rgfn_backward_policy__log_probs_with_backbone_match_separate_log_probs(
+    rgfn_forward_policy: ReactionForwardPolicy,
+    rgfn_backward_policy_with_backbone: ReactionBackwardPolicy,
+    rgfn_env: ReactionEnv,
+    n_trajectories: int,
+):
+    seed_everything(42)
+    sampler = RandomSampler(policy=UniformPolicy(), env=rgfn_env, reward=None)
+    trajectories = sampler.sample_trajectories(n_trajectories=n_trajectories)
+    actions = trajectories.get_actions_flat()
+    forward_states = trajectories.get_non_last_states_flat()
+    forward_action_spaces = trajectories.get_forward_action_spaces_flat()
+    backward_states = trajectories.get_non_source_states_flat()
+    backward_action_spaces = trajectories.get_backward_action_spaces_flat()
+
+    assert rgfn_backward_policy_with_backbone.shares_backbone_with(rgfn_forward_policy)
+    (
+        forward_log_probs,
+        backward_log_probs,
+    ) = rgfn_backward_policy_with_backbone.compute_action_log_probs_with_backbone(
+        backbone_policy=rgfn_forward_policy,
+        forward_states=forward_states,
+        forward_action_spaces=forward_action_spaces,
+        backward_states=backward_states,
+        backward_action_spaces=backward_action_spaces,
+        actions=actions,
+    )
+    expected_forward_log_probs = rgfn_forward_policy.compute_action_log_probs(
+        forward_states, forward_action_spaces, actions
+    )
+    expected_backward_log_probs = rgfn_backward_policy_with_backbone.compute_action_log_probs(
+        backward_states, backward_action_spaces, actions
+    )
+
+    assert torch.allclose(forward_log_probs, expected_forward_log_probs, atol=1e-5)
+    assert torch.allclose(backward_log_probs, expected_backward_log_probs, atol=1e-5)
+
+
+@pytest.mark.parametrize("option", ["use_bf16", "compile_model"])
+def test__rgfn_backward_policy__rejects_options_ignored_with_backbone(
+    rgfn_data_factory: ReactionDataFactory,
+    rgfn_forward_policy: ReactionForwardPolicy,
+    option: str,
+):
+    with pytest.raises(ValueError):
+        ReactionBackwardPolicy(
+            data_factory=rgfn_data_factory, backbone_policy=rgfn_forward_policy, **{option: True}
+        )
@@ -0,0 +1,71 @@
+import torch
+
+from rgfn.utils.helpers import Cache, ContentHeap, seed_everything
+
+
+def test__content_heap__keeps_distinct_items_with_equal_hashes():
+    heap = ContentHeap(max_size=3)
+    heap.push(1.0, -1)
+    heap.push(2.0, -2)  # hash(-1) == hash(-2)
+    heap.push(3.0, -1)
+
+    assert sorted(t.item for t in heap) == [-2, -1]
+
+
+def test__content_heap__keeps_top_values_and_allows_reinserting_evicted_items():
+    heap = ContentHeap(max_size=2)
+    heap.push(1.0, "a")
+    heap.push(2.0, "b")
+    heap.push(3.0, "c")
+
+    assert sorted(t.item for t in heap) == ["b", "c"]
+    assert "a" not in heap.items.get(hash("a"), [])
+
+    heap.push(4.0, "a")
+    assert sorted(t.item for t in heap) == ["a", "c"]
+
+
+def test__cache__evicts_least_recently_used():
+    cache: Cache[str, int] = Cache(max_size=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # "b" becomes the least recently used
+    cache["c"] = 3
+
+    assert len(cache) == 2
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test__cache__get_and_setitem_refresh_recency():
+    cache: Cache[str, int] = Cache(max_size=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.get("a")
+    cache["b"] = 20  # overwriting refreshes "b", so "a" is the least recently used
+    cache["c"] = 3
+
+    assert "a" not in cache
+    assert cache["b"] == 20
+    assert cache.get("a", -1) == -1
+
+
+def test__cache__clear():
+    cache: Cache[str, int] = Cache(max_size=2)
+    cache["a"] = 1
+    cache.clear()
+
+    assert len(cache) == 0
+    assert "a" not in cache
+
+
+def test__seed_everything__leaves_determinism_flags_by_default():
+    benchmark = torch.backends.cudnn.benchmark
+    torch.use_deterministic_algorithms(True)
+    try:
+        seed_everything(42)
+        assert torch.are_deterministic_algorithms_enabled()
+        assert torch.backends.cudnn.benchmark == benchmark
+    finally:
+        torch.use_deterministic_algorithms(False)
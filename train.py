@@ -17,10 +17,10 @@ if __name__ == "__main__":
     config = args.cfg
     checkpoint_path = args.checkpoint_path
 
-    seed_everything(seed)
     config_name = Path(config).stem
     run_name = f"{config_name}/{get_time_stamp()}"
     gin.parse_config_files_and_bindings([config], bindings=[f'run_name="{run_name}"'])
+    seed_everything(seed)
     trainer = Trainer(resume_path=checkpoint_path)
     trainer.logger.log_code("rgfn")
     trainer.logger.log_to_file(gin.operative_config_str(), "operative_config")